@@ -0,0 +1,414 @@
+from typing import Optional, Dict, Any
+
+# GraphQL Client
+from gql import Client, gql
+from gql.transport.exceptions import TransportQueryError
+from gql.transport.httpx import HTTPXAsyncTransport
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    GraphQLError,
+    GraphQLSchema,
+    NameNode,
+    OperationDefinitionNode,
+    OperationType,
+    SelectionSetNode,
+    Visitor,
+    build_schema,
+    print_schema,
+    visit,
+)
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+import asyncio
+import httpx
+from copy import copy
+from functools import lru_cache
+from cachetools import TTLCache
+
+# Only read .env when the environment doesn't already provide the settings
+if not (os.environ.get("GRAPHQL_API_KEY") and os.environ.get("GRAPHQL_ENDPOINT")):
+    from dotenv import load_dotenv
+
+    load_dotenv()  # Load the .env file
+
+GRAPHQL_API_KEY = os.environ.get("GRAPHQL_API_KEY")
+GRAPHQL_ENDPOINT = os.environ.get("GRAPHQL_ENDPOINT")
+
+SCHEMA_CACHE_TTL = 3600  # seconds a schema persisted on disk stays valid
+MAX_CONCURRENT_QUERIES = 32
+RESULT_CACHE_SIZE = 1024
+RESULT_CACHE_TTL = 60  # seconds a query result is served from memory
+RETRY_ATTEMPTS = 3
+RETRY_MIN_DELAY = 2  # seconds
+RETRY_MAX_DELAY = 10
+
+# The server rejected the query, or gql's local schema validation did; sending it again can't help
+_NOT_RETRYABLE = (TransportQueryError, GraphQLError)
+
+async def _with_retry(fn, *args, **kwargs):
+    """Await fn, retrying transport failures with exponential backoff"""
+    for attempt in range(RETRY_ATTEMPTS):
+        try:
+            return await fn(*args, **kwargs)
+        except _NOT_RETRYABLE:
+            raise
+        except Exception:
+            if attempt == RETRY_ATTEMPTS - 1:
+                raise
+            # Same schedule as tenacity's wait_exponential(multiplier=1, min=2, max=10): 2s, then 2s
+            await asyncio.sleep(min(max(2 ** attempt, RETRY_MIN_DELAY), RETRY_MAX_DELAY))
+
+def _cache_dir() -> str:
+    """Per-user directory for the persisted schema; the shared temp dir is writable by anyone"""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "mcp-server-truerag")
+
+def _request_key(query: str, variables: Optional[Dict[str, Any]]) -> tuple:
+    """Identify a request independently of the order its variables were given in"""
+    return query, json.dumps(variables, sort_keys=True)
+
+# Serialized once at import; posted as-is to verify connectivity
+_PROBE_BODY = json.dumps({"query": "query{__schema{queryType{name}}}"}).encode()
+PROBE_TIMEOUT = 30
+
+@lru_cache(maxsize=512)
+def _compile(query: str) -> DocumentNode:
+    """Parse a query string into a DocumentNode, reusing the result for repeated queries"""
+    return gql(query)
+
+@lru_cache(maxsize=512)
+def _is_read_only(query: str) -> bool:
+    """Whether every operation in the query is a read, so its result may be cached or shared"""
+    return all(
+        definition.operation is OperationType.QUERY
+        for definition in _compile(query).definitions
+        if isinstance(definition, OperationDefinitionNode)
+    )
+
+def _renamed(node, name: str):
+    """Return a shallow copy of a named AST node with a new name"""
+    node = copy(node)
+    node.name = NameNode(value=name)
+    return node
+
+class _PrefixVisitor(Visitor):
+    """Prefix variable and fragment names so several documents can share one operation"""
+
+    def __init__(self, prefix: str):
+        super().__init__()
+        self.prefix = prefix
+
+    def enter_variable(self, node, *_):
+        return _renamed(node, self.prefix + node.name.value)
+
+    def enter_fragment_spread(self, node, *_):
+        return _renamed(node, self.prefix + node.name.value)
+
+    def enter_fragment_definition(self, node, *_):
+        return _renamed(node, self.prefix + node.name.value)
+
+def _batchable(document: DocumentNode) -> bool:
+    """Only single, undirected queries selecting plain root fields can be merged by aliasing"""
+    operations = [d for d in document.definitions if isinstance(d, OperationDefinitionNode)]
+    if len(operations) != 1:
+        return False
+    operation = operations[0]
+    return (
+        operation.operation is OperationType.QUERY
+        and not operation.directives
+        and all(isinstance(s, FieldNode) for s in operation.selection_set.selections)
+    )
+
+def _batch_prefix(index: int) -> str:
+    return f"batch{index}_"
+
+def _merge_documents(batch: list) -> tuple:
+    """Combine (document, variables) pairs into one aliased query and its merged variables"""
+    variable_definitions, selections, fragments, merged_variables = [], [], [], {}
+    for index, (document, variables) in enumerate(batch):
+        prefix = _batch_prefix(index)
+        document = visit(document, _PrefixVisitor(prefix))
+        for definition in document.definitions:
+            if not isinstance(definition, OperationDefinitionNode):
+                fragments.append(definition)
+                continue
+            variable_definitions.extend(definition.variable_definitions or ())
+            for field in definition.selection_set.selections:
+                field = copy(field)
+                field.alias = NameNode(value=prefix + (field.alias or field.name).value)
+                selections.append(field)
+        merged_variables.update({prefix + k: v for k, v in (variables or {}).items()})
+
+    operation = OperationDefinitionNode(
+        operation=OperationType.QUERY,
+        variable_definitions=tuple(variable_definitions),
+        directives=(),
+        selection_set=SelectionSetNode(selections=tuple(selections)),
+    )
+    return DocumentNode(definitions=(operation, *fragments)), merged_variables
+
+def _split_result(result: Dict[str, Any], index: int) -> Dict[str, Any]:
+    """Extract one caller's fields from a merged result, restoring their original keys"""
+    prefix = _batch_prefix(index)
+    return {key[len(prefix):]: value for key, value in result.items() if key.startswith(prefix)}
+
+class GraphQLClient:
+    def __init__(self, endpoint: str):
+        # Without an endpoint there is nothing to key the disk cache on; calls fail later with a clear error
+        self.cache_path = os.path.join(
+            _cache_dir(),
+            f"schema_{hashlib.sha1(endpoint.encode()).hexdigest()}.graphql",
+        ) if endpoint else None
+        self.endpoint = endpoint
+        self.headers = {
+            "x-api-key": GRAPHQL_API_KEY,
+            'Content-Type': 'application/json',
+        }
+        # HTTP/2 multiplexes concurrent queries over one warm connection
+        self.transport = HTTPXAsyncTransport(
+            url=endpoint,
+            headers=self.headers,
+            timeout=60,  # 60 seconds timeout
+            http2=True,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=300),
+        )
+        self.client = Client(transport=self.transport, fetch_schema_from_transport=True)
+        self.schema = None  # Cache for schema
+        self._schema_obj = None
+        self._session = None  # Long-lived session, opened on first use
+        self._session_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        self._inflight = {}  # request key -> (generation, Task) shared by identical concurrent queries
+        self._result_cache = TTLCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL)
+        self._generation = 0  # bumped by every mutation; reads from an older generation may be stale
+
+    def clear_cache(self):
+        """Drop all cached query results"""
+        self._result_cache.clear()
+
+    async def _ensure_session(self):
+        """Connect once and keep the session and its connection pool for the process lifetime"""
+        if self._session is None:
+            async with self._session_lock:
+                if self._session is None:
+                    try:
+                        self._session = await self.client.connect_async()
+                    except Exception:
+                        # Leave the transport closed so the next attempt can reconnect
+                        await self.transport.close()
+                        raise
+                    self._refresh_schema()
+        return self._session
+
+    @property
+    def schema_obj(self) -> Optional[GraphQLSchema]:
+        """The schema as a GraphQLSchema, rebuilt from the cached SDL if no session has introspected it"""
+        if self._schema_obj is None and self.schema is not None:
+            self._schema_obj = build_schema(self.schema)
+        return self._schema_obj
+
+    def _refresh_schema(self):
+        """Replace the cached schema if the endpoint's introspected schema differs from it"""
+        self._schema_obj = self.client.schema
+        schema = print_schema(self._schema_obj)
+        if schema != self.schema:
+            self.schema = schema
+            self._write_schema_cache(schema)
+
+    async def ping(self) -> None:
+        """Post a minimal introspection query directly, without building a gql session"""
+        async with httpx.AsyncClient(http2=True, timeout=PROBE_TIMEOUT) as http:
+            response = await http.post(self.endpoint, content=_PROBE_BODY, headers=self.headers)
+        response.raise_for_status()
+        errors = response.json().get("errors")
+        if errors:
+            raise TransportQueryError(str(errors[0]), errors=errors)
+
+    async def close(self):
+        """Close the long-lived session, if one is open"""
+        if self._session is not None:
+            self._session = None
+            await self.client.close_async()
+        
+    async def get_schema(self) -> str:
+        """Fetch and return the GraphQL schema as a string"""
+        if self.schema is not None:
+            return self.schema
+
+        # Reuse the schema persisted by a previous process if it is fresh enough
+        schema = self._read_schema_cache()
+        if schema is not None:
+            self.schema = schema
+            return self.schema
+
+        # Connecting introspects the endpoint and stores the printed schema
+        await _with_retry(self._ensure_session)
+        return self.schema
+
+    def _read_schema_cache(self) -> Optional[str]:
+        """Return the persisted SDL if it exists, belongs to the current user and is fresh enough"""
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path, encoding="utf-8") as f:
+                stat = os.fstat(f.fileno())
+                # The SDL is pasted into LLM prompts, so never trust a file someone else wrote
+                if hasattr(os, "getuid") and stat.st_uid != os.getuid():
+                    return None
+                if time.time() - stat.st_mtime >= SCHEMA_CACHE_TTL:
+                    return None
+                return f.read()
+        except (OSError, ValueError):
+            return None
+
+    def _write_schema_cache(self, schema: str) -> None:
+        """Persist the printed schema atomically so concurrent readers never see a partial file"""
+        if self.cache_path is None:
+            return
+        cache_dir = os.path.dirname(self.cache_path)
+        tmp_path = None
+        try:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(schema)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            # The disk cache is an optimization only; never fail the request over it
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            
+    async def execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a GraphQL query and return the results"""
+        if not _is_read_only(query):
+            try:
+                return await self._send(query, variables)
+            finally:
+                # A write may change anything we have cached or are still reading
+                self._generation += 1
+                self.clear_cache()
+
+        key = _request_key(query, variables)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        generation = self._generation
+        inflight = self._inflight.get(key)
+        if inflight is None or inflight[0] != generation:
+            task = asyncio.create_task(self._fetch_shared(key, query, variables, generation))
+            inflight = (generation, task)
+            self._inflight[key] = inflight
+            task.add_done_callback(lambda _, entry=inflight: self._forget_inflight(key, entry))
+        # Every caller, the first included, waits through a shield so that
+        # cancelling one of them never cancels the request the others share
+        return await asyncio.shield(inflight[1])
+
+    async def _fetch_shared(self, key: tuple, query: str, variables: Optional[Dict[str, Any]], generation: int) -> Dict[str, Any]:
+        result = await self._send(query, variables)
+        # Only cache if no mutation completed while this read was in flight
+        if self._generation == generation:
+            self._result_cache[key] = result
+        return result
+
+    def _forget_inflight(self, key: tuple, entry: tuple):
+        # A newer-generation read may have replaced this entry; leave it in place
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+        task = entry[1]
+        if not task.cancelled():
+            task.exception()  # callers see it through the shield; don't log it as unretrieved
+
+    async def _send(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Execute a query with retries, bounding how many are outstanding at once"""
+        document = _compile(query)
+        async with self._semaphore:
+            return await _with_retry(self._execute, document, variables)
+
+    async def _execute(self, document: DocumentNode, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Send a parsed document to the endpoint"""
+        session = await self._ensure_session()
+        return await session.execute(document, variable_values=variables)
+
+class BatchingGraphQLClient(GraphQLClient):
+    """GraphQLClient that coalesces queries arriving within a short window into one request"""
+
+    def __init__(self, endpoint: str, batch_window: float = 0.01, max_batch: int = 10):
+        super().__init__(endpoint)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self._pending = []
+        self._flush_task = None
+        self._tasks = set()  # strong references so running flushes are not garbage-collected
+
+    async def _execute(self, document: DocumentNode, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        if not _batchable(document):
+            return await super()._execute(document, variables)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((document, variables, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush())
+            self._tasks.add(self._flush_task)
+            self._flush_task.add_done_callback(self._tasks.discard)
+        return await future
+
+    async def _flush(self):
+        """Wait for the batch window to close, then send everything queued during it"""
+        await asyncio.sleep(self.batch_window)
+        pending, self._pending, self._flush_task = self._pending, [], None
+        await asyncio.gather(*(
+            self._send_batch(pending[i:i + self.max_batch])
+            for i in range(0, len(pending), self.max_batch)
+        ))
+
+    async def _send_batch(self, batch: list):
+        """Send one batch, making sure every caller's future is resolved whatever happens"""
+        try:
+            await self._send_merged(batch)
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+
+    async def _send_merged(self, batch: list):
+        if len(batch) > 1:
+            document, variables = _merge_documents([(d, v) for d, v, _ in batch])
+            try:
+                result = await super()._execute(document, variables)
+            except _NOT_RETRYABLE:
+                # A query was rejected; send each on its own so one bad query does
+                # not fail the others. Transport failures propagate to every caller's
+                # retry instead, since resending singly would only repeat the outage.
+                pass
+            else:
+                for index, (_, _, future) in enumerate(batch):
+                    if not future.done():
+                        future.set_result(_split_result(result, index))
+                return
+
+        await asyncio.gather(*(self._send_one(*item) for item in batch))
+
+    async def _send_one(self, document: DocumentNode, variables: Optional[Dict[str, Any]], future: asyncio.Future):
+        try:
+            result = await super()._execute(document, variables)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(result)
+
+client = BatchingGraphQLClient(GRAPHQL_ENDPOINT)
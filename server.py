@@ -1,94 +1,53 @@
 from fastmcp import FastMCP
-from typing import Optional, Dict, Any
+from typing import Optional, Any, List
 
 # GraphQL Server
-from gql import Client, gql
-from gql.transport.aiohttp import AIOHTTPTransport
-from graphql import print_schema
+from gql_client import GRAPHQL_ENDPOINT, client
 
 import json
-import os
 import asyncio
-from tenacity import retry, stop_after_attempt, wait_exponential
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib
+    orjson = None
 
 # Create a named server
 mcp = FastMCP("GQL")
 
-from dotenv import load_dotenv
-
-load_dotenv()  # Load the .env file
-
-GRAPHQL_API_KEY = os.environ.get("GRAPHQL_API_KEY")
-GRAPHQL_ENDPOINT = os.environ.get("GRAPHQL_ENDPOINT")
-
-class GraphQLClient:
-    def __init__(self, endpoint: str):
-        self.transport = AIOHTTPTransport(
-            url=endpoint,
-            headers={
-                "x-api-key": GRAPHQL_API_KEY,
-                'Content-Type': 'application/json',
-            },
-            timeout=60,  # 60 seconds timeout
-        )
-        self.client = Client(transport=self.transport, fetch_schema_from_transport=True)
-        self.schema = None  # Cache for schema
-        
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def get_schema(self) -> str:
-        """Fetch and return the GraphQL schema as a string"""
-        if self.schema is not None:
-            return self.schema
-            
-        async with self.client as session:
-            schema = session.client.schema
-            self.schema = print_schema(schema)
-            return self.schema
-            
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10))
-    async def execute_query(self, query: str, variables: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Execute a GraphQL query and return the results"""
-        async with self.client as session:
-            result = await session.execute(gql(query), variable_values=variables)
-            return result
-
-client = GraphQLClient(GRAPHQL_ENDPOINT)
+def _dumps(obj: Any) -> str:
+    """Serialize a query result as indented JSON"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+        except orjson.JSONEncodeError:
+            pass  # e.g. integers beyond 64 bits, which the stdlib handles
+    return json.dumps(obj, indent=2)
+
+def _loads(data: str) -> Any:
+    """Parse a JSON string"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity, which the stdlib accepts
+    return json.loads(data)
 
 @mcp.tool()
 async def connect_graphql() -> str:
     """Connect to the GraphQL endpoint and fetch its schema"""
     try:
-        # Use a simple test query first to verify connectivity
-        async with client.client as session:
-            test_query = gql("""
-            query {
-                __schema {
-                    queryType {
-                        name
-                    }
-                }
-            }
-            """)
-            await session.execute(test_query)
-        
-        # If we get here, the connection is working, now get the schema
-        schema = await client.get_schema()
+        # The probe and the schema load are independent round-trips, so overlap them.
+        # With a warm schema cache this is just the probe.
+        await asyncio.gather(client.ping(), client.get_schema())
         return f"Successfully connected to {GRAPHQL_ENDPOINT}. Schema loaded."
     except Exception as e:
         return f"Error connecting to GraphQL endpoint: {str(e)}"
 
-@mcp.tool()
-async def generate_query(description: str) -> str:
-    """Generate a GraphQL query based on the schema and user description"""
-    try:
-        schema = await client.get_schema()
-        
-        # Provide context about the schema and request to help generate the query
-        prompt = f"""Given this GraphQL schema:
-
-{schema}
+_PROMPT_HEAD = "Given this GraphQL schema:\n\n"
+_PROMPT_MID = "\n\nGenerate a GraphQL query that: "
 
-Generate a GraphQL query that: {description}.
+_PROMPT_TAIL = """.
 
 Please note that the GraphQL API is designed to answer policy questions for a specific organization.
 The quesions of the users related to a speicific country where they are located or want to go. 
@@ -97,23 +56,32 @@ When you ask for policies, don't filter by their names, as you don't know them y
 Please note that you should also request the policy holder of the policies, and then check for their type. The policies are organized in an hierarchy, where lower levels override higher levels (for example: a policy of a country can override a policy of a region).
 For example, here is a query to get all the policies of a state:
 ```graphql
-query sampleCountryQuery {{
-  country(id: "KR") {{
+query sampleCountryQuery {
+  country(id: "KR") {
     country_name
-    policies {{
+    policies {
       policy_type
       policy_document
-      policy_holder {{
+      policy_holder {
         __typename
-      }}
-    }}
-  }}
-}}
+      }
+    }
+  }
+}
 ```
 
 Return only the GraphQL query without any explanation."""
-        
-        return prompt
+
+def _build_prompt(schema: str, description: str) -> str:
+    """Build the query-generation prompt"""
+    # Provide context about the schema and request to help generate the query
+    return "".join((_PROMPT_HEAD, schema, _PROMPT_MID, description, _PROMPT_TAIL))
+
+@mcp.tool()
+async def generate_query(description: str) -> str:
+    """Generate a GraphQL query based on the schema and user description"""
+    try:
+        return _build_prompt(await client.get_schema(), description)
     except Exception as e:
         return f"Error generating query: {str(e)}"
 
@@ -121,14 +89,25 @@ Return only the GraphQL query without any explanation."""
 async def execute_graphql(query: str, variables: Optional[str] = None) -> str:
     """Execute a GraphQL query against the connected endpoint"""
     try:
-        vars_dict = json.loads(variables) if variables else None
+        vars_dict = _loads(variables) if variables else None
         result = await client.execute_query(query, vars_dict)
-        return json.dumps(result, indent=2)
+        return _dumps(result)
     except Exception as e:
         return f"Error executing query: {str(e)}"
 
+@mcp.tool()
+def invalidate_cache() -> str:
+    """Clear cached query results so the next queries hit the endpoint"""
+    client.clear_cache()
+    return "Query result cache cleared."
+
 
 @mcp.tool()
 def calculate_bmi(weight_kg: float, height_m: float) -> float:
     """Calculate BMI given weight in kg and height in meters"""
-    return weight_kg / (height_m ** 2)
+    return weight_kg / (height_m * height_m)
+
+@mcp.tool()
+def calculate_bmi_batch(weights_kg: List[float], heights_m: List[float]) -> List[float]:
+    """Calculate BMI for paired lists of weights in kg and heights in meters"""
+    return [w / (h * h) for w, h in zip(weights_kg, heights_m, strict=True)]
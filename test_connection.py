@@ -1,48 +1,24 @@
-import os
 import asyncio
-from dotenv import load_dotenv
-from gql import Client, gql
-from gql.transport.aiohttp import AIOHTTPTransport
 
-load_dotenv()  # Load the .env file
-
-GRAPHQL_API_KEY = os.environ.get("GRAPHQL_API_KEY")
-GRAPHQL_ENDPOINT = os.environ.get("GRAPHQL_ENDPOINT")
+from gql_client import GRAPHQL_API_KEY, GRAPHQL_ENDPOINT, client
 
 async def test_connection():
-    transport = AIOHTTPTransport(
-        url=GRAPHQL_ENDPOINT,
-        headers={
-            "x-api-key": GRAPHQL_API_KEY,
-            'Content-Type': 'application/json',
-        },
-        timeout=30,  # 30 seconds timeout
-    )
-    
-    client = Client(transport=transport, fetch_schema_from_transport=True)
-    
     try:
-        async with client as session:
-            query = gql("""
-            query {
-                __schema {
-                    queryType {
-                        name
-                    }
-                }
-            }
-            """)
-            result = await session.execute(query)
-            print("Connection successful!")
-            print(result)
-            return True
+        # Reuses the schema cache the server writes, so only the probe is guaranteed to hit the network
+        await client.ping()
+        schema = await client.get_schema()
+        print("Connection successful!")
+        print(f"Schema loaded ({len(schema)} characters)")
+        return True
     except Exception as e:
         print(f"Error connecting: {str(e)}")
         return False
+    finally:
+        await client.close()
 
 # Run the test
 if __name__ == "__main__":
     print(f"Testing connection to: {GRAPHQL_ENDPOINT}")
     print(f"Using API key: {GRAPHQL_API_KEY[:5]}...")
     success = asyncio.run(test_connection())
-    print(f"Connection test {'successful' if success else 'failed'}")
\ No newline at end of file
+    print(f"Connection test {'successful' if success else 'failed'}")
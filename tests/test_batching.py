@@ -0,0 +1,182 @@
+import asyncio
+
+import pytest
+from gql.transport.exceptions import TransportQueryError
+from graphql import build_schema, graphql_sync, parse, print_ast, validate
+
+import gql_client
+from gql_client import (
+    BatchingGraphQLClient,
+    GraphQLClient,
+    _batchable,
+    _merge_documents,
+    _split_result,
+)
+
+SCHEMA = build_schema("""
+type Query {
+    country(id: ID!): Country
+    hello: String
+}
+
+type Country {
+    id: ID!
+    name: String
+    code: String
+}
+
+type Mutation {
+    bump: Int
+}
+""")
+
+COUNTRY_QUERY = """
+query Country($id: ID!) {
+    country(id: $id) {
+        name
+        ...CountryCode
+    }
+}
+
+fragment CountryCode on Country {
+    code
+}
+"""
+
+ALIASED_QUERY = '{ c: country(id: "KR") { name } hello }'
+
+
+class _Root:
+    hello = "world"
+
+    def country(self, info, id):
+        return {"id": id, "name": f"name-{id}", "code": id.lower()}
+
+
+def test_merge_prefixes_aliases_variables_and_fragments():
+    first, second = parse(COUNTRY_QUERY), parse(ALIASED_QUERY)
+    document, variables = _merge_documents([(first, {"id": "FR"}), (second, None)])
+    printed = print_ast(document)
+
+    assert "$batch0_id: ID!" in printed
+    assert "batch0_country: country(id: $batch0_id)" in printed
+    assert "...batch0_CountryCode" in printed
+    assert "fragment batch0_CountryCode on Country" in printed
+    assert 'batch1_c: country(id: "KR")' in printed
+    assert "batch1_hello: hello" in printed
+    assert variables == {"batch0_id": "FR"}
+    assert validate(SCHEMA, document) == []
+
+
+def test_merge_leaves_input_documents_untouched():
+    first = parse(COUNTRY_QUERY)
+    before = print_ast(first)
+    _merge_documents([(first, {"id": "FR"}), (parse(ALIASED_QUERY), None)])
+    assert print_ast(first) == before
+
+
+def test_split_result_restores_original_keys_per_caller():
+    result = {
+        "batch1_c": {"name": "KR"},
+        "batch1_hello": "world",
+        "batch10_c": {"name": "other"},
+        "batch0_country": {"name": "FR"},
+    }
+    assert _split_result(result, 0) == {"country": {"name": "FR"}}
+    assert _split_result(result, 1) == {"c": {"name": "KR"}, "hello": "world"}
+    assert _split_result(result, 10) == {"c": {"name": "other"}}
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (ALIASED_QUERY, True),
+        (COUNTRY_QUERY, True),
+        ("mutation { bump }", False),
+        ("{ ...Root } fragment Root on Query { hello }", False),
+        ("query A { hello } query B { hello }", False),
+        ("query @live { hello }", False),
+    ],
+)
+def test_batchable(query, expected):
+    assert _batchable(parse(query)) is expected
+
+
+def test_concurrent_queries_are_sent_as_one_request(monkeypatch):
+    sent = []
+
+    async def execute(self, document, variables=None):
+        sent.append(document)
+        result = graphql_sync(SCHEMA, print_ast(document), _Root(), variable_values=variables)
+        assert not result.errors
+        return result.data
+
+    monkeypatch.setattr(GraphQLClient, "_execute", execute)
+    client = BatchingGraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        return await asyncio.gather(
+            client.execute_query(COUNTRY_QUERY, {"id": "FR"}),
+            client.execute_query(ALIASED_QUERY),
+        )
+
+    first, second = asyncio.run(run())
+    assert len(sent) == 1
+    assert first == {"country": {"name": "name-FR", "code": "fr"}}
+    assert second == {"c": {"name": "name-KR"}, "hello": "world"}
+
+
+def test_batch_failure_resolves_every_future(monkeypatch):
+    def broken_merge(batch):
+        raise RuntimeError("merge failed")
+
+    monkeypatch.setattr(gql_client, "_merge_documents", broken_merge)
+    client = BatchingGraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        batch = [(parse(ALIASED_QUERY), None, loop.create_future()) for _ in range(2)]
+        await client._send_batch(batch)
+        return [future.exception() for _, _, future in batch]
+
+    errors = asyncio.run(run())
+    assert [str(e) for e in errors] == ["merge failed", "merge failed"]
+
+
+def _failing_merged_request(monkeypatch, error):
+    """Make the merged request fail with error while single queries succeed; return the sent documents"""
+    sent = []
+
+    async def execute(self, document, variables=None):
+        sent.append(document)
+        if len(sent) == 1:
+            raise error
+        return {"hello": "world"}
+
+    monkeypatch.setattr(GraphQLClient, "_execute", execute)
+    return sent
+
+
+def _send_two(client):
+    async def run():
+        loop = asyncio.get_running_loop()
+        batch = [(parse("{ hello }"), None, loop.create_future()) for _ in range(2)]
+        await client._send_batch(batch)
+        return [future.exception() or future.result() for _, _, future in batch]
+
+    return asyncio.run(run())
+
+
+def test_rejected_batch_falls_back_to_single_queries(monkeypatch):
+    sent = _failing_merged_request(monkeypatch, TransportQueryError("bad field"))
+    results = _send_two(BatchingGraphQLClient("http://example.invalid/graphql"))
+    assert results == [{"hello": "world"}, {"hello": "world"}]
+    assert len(sent) == 3
+
+
+def test_transport_failure_is_not_resent_singly(monkeypatch):
+    error = ConnectionError("connection reset")
+    sent = _failing_merged_request(monkeypatch, error)
+    results = _send_two(BatchingGraphQLClient("http://example.invalid/graphql"))
+    assert results == [error, error]
+    assert len(sent) == 1
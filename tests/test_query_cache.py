@@ -0,0 +1,139 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from graphql import OperationType
+
+import server
+from gql_client import GraphQLClient, _is_read_only
+
+
+@pytest.fixture
+def endpoint(monkeypatch):
+    """Stand in for the network: mutations bump a counter, queries read it"""
+    state = SimpleNamespace(calls=0, counter=0, gate=None)
+
+    async def execute(self, document, variables=None):
+        state.calls += 1
+        if document.definitions[0].operation is OperationType.MUTATION:
+            state.counter += 1
+            return {"bump": state.counter}
+        value = state.counter
+        if state.gate is not None:
+            await state.gate.wait()
+        return {"counter": value}
+
+    monkeypatch.setattr(GraphQLClient, "_execute", execute)
+    return state
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("{ counter }", True),
+        ("# mutation { bump }\nquery { counter }", True),
+        ("query Q { counter } fragment F on Query { counter }", True),
+        ("# bump the counter\nmutation { bump }", False),
+        ("  \n\t mutation { bump }", False),
+        ("fragment F on Query { counter }\nmutation { bump }", False),
+        ("query Q { counter } mutation M { bump }", False),
+        ("subscription { counter }", False),
+    ],
+)
+def test_is_read_only(query, expected):
+    assert _is_read_only(query) is expected
+
+
+async def _settle():
+    """Let freshly created tasks run up to their first real wait"""
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def test_cancelling_first_caller_does_not_cancel_followers(endpoint):
+    client = GraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        endpoint.gate = asyncio.Event()
+        first = asyncio.create_task(client.execute_query("{ counter }"))
+        await _settle()
+        follower = asyncio.create_task(client.execute_query("{ counter }"))
+        await _settle()
+        first.cancel()
+        await _settle()
+        endpoint.gate.set()
+        return first, await follower
+
+    first, result = asyncio.run(run())
+    assert first.cancelled()
+    assert result == {"counter": 0}
+    assert endpoint.calls == 1
+
+
+def test_identical_concurrent_reads_share_one_request(endpoint):
+    client = GraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        endpoint.gate = asyncio.Event()
+        reads = [asyncio.create_task(client.execute_query("{ counter }")) for _ in range(2)]
+        await _settle()
+        endpoint.gate.set()
+        return await asyncio.gather(*reads)
+
+    assert asyncio.run(run()) == [{"counter": 0}, {"counter": 0}]
+    assert endpoint.calls == 1
+
+
+def test_results_are_cached_until_cleared(endpoint, monkeypatch):
+    client = GraphQLClient("http://example.invalid/graphql")
+    monkeypatch.setattr(server, "client", client)
+
+    async def run():
+        await client.execute_query("{ counter }")
+        await client.execute_query("{ counter }")
+        assert endpoint.calls == 1
+        client.clear_cache()
+        await client.execute_query("{ counter }")
+        assert endpoint.calls == 2
+        server.invalidate_cache()
+        await client.execute_query("{ counter }")
+        assert endpoint.calls == 3
+
+    asyncio.run(run())
+
+
+def test_read_overlapping_a_mutation_is_not_cached(endpoint):
+    client = GraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        endpoint.gate = asyncio.Event()
+        read = asyncio.create_task(client.execute_query("{ counter }"))
+        await _settle()
+        await client.execute_query("mutation { bump }")
+        endpoint.gate.set()
+        stale = await read
+        return stale, await client.execute_query("{ counter }")
+
+    stale, fresh = asyncio.run(run())
+    assert stale == {"counter": 0}
+    assert fresh == {"counter": 1}
+    assert endpoint.calls == 3
+
+
+def test_read_after_a_mutation_does_not_join_an_older_read(endpoint):
+    client = GraphQLClient("http://example.invalid/graphql")
+
+    async def run():
+        endpoint.gate = asyncio.Event()
+        older = asyncio.create_task(client.execute_query("{ counter }"))
+        await _settle()
+        await client.execute_query("mutation { bump }")
+        newer = asyncio.create_task(client.execute_query("{ counter }"))
+        await _settle()
+        endpoint.gate.set()
+        return await older, await newer
+
+    older, newer = asyncio.run(run())
+    assert older == {"counter": 0}
+    assert newer == {"counter": 1}
+    assert endpoint.calls == 3
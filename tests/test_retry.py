@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from gql.transport.exceptions import TransportQueryError
+from graphql import GraphQLError
+
+import gql_client
+from gql_client import _with_retry
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(gql_client.asyncio, "sleep", sleep)
+    return delays
+
+
+def _failing(errors):
+    calls = []
+
+    async def fn():
+        calls.append(None)
+        if errors:
+            raise errors.pop(0)
+        return "ok"
+
+    return fn, calls
+
+
+def test_transient_errors_are_retried_with_tenacity_schedule(sleeps):
+    fn, calls = _failing([ConnectionError("reset"), ConnectionError("reset")])
+    assert asyncio.run(_with_retry(fn)) == "ok"
+    assert len(calls) == 3
+    assert sleeps == [2, 2]
+
+
+def test_gives_up_after_the_last_attempt(sleeps):
+    fn, calls = _failing([ConnectionError(str(i)) for i in range(3)])
+    with pytest.raises(ConnectionError, match="2"):
+        asyncio.run(_with_retry(fn))
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize("error", [TransportQueryError("bad query"), GraphQLError("unknown field")])
+def test_query_errors_are_not_retried(sleeps, error):
+    fn, calls = _failing([error])
+    with pytest.raises(type(error)):
+        asyncio.run(_with_retry(fn))
+    assert len(calls) == 1
+    assert sleeps == []
@@ -0,0 +1,24 @@
+import json
+import math
+
+import pytest
+
+from server import _dumps, _loads
+
+
+def test_dumps_handles_integers_beyond_64_bits():
+    assert json.loads(_dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+
+def test_loads_accepts_non_finite_numbers():
+    assert math.isnan(_loads('{"x": NaN}')["x"])
+    assert _loads('{"x": Infinity}')["x"] == math.inf
+
+
+def test_loads_still_rejects_invalid_json():
+    with pytest.raises(json.JSONDecodeError):
+        _loads("{not json")
+
+
+def test_dumps_indents_output():
+    assert _dumps({"a": [1]}) == '{\n  "a": [\n    1\n  ]\n}'